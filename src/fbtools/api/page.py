@@ -1,9 +1,9 @@
 """Page node of Facebook Graph API."""
 
 import asyncio
-from collections.abc import Coroutine
+import logging
 from pathlib import Path
-from typing import Callable, Literal
+from typing import Literal
 from fbtools.api.post import FacebookPost
 from fbtools.models.page.feed_id_response import FeedIdResponse
 from fbtools.models.page.feed_post_upload import AttachedMedia, FeedPostUploadData
@@ -16,10 +16,16 @@ from fbtools.models.page.video_upload_status import VideoUploadStatus
 from fbtools.models.page.video_uploading_local_file_response import (
     VideoUploadingLocalFileResponse,
 )
-from fbtools.utilities.common import create_base_url, is_url_valid
-from fbtools.utilities.core import create_photo_id
+from fbtools.utilities.common import (
+    create_session,
+    is_url_valid,
+    raise_for_status,
+    read_chunk,
+)
+from fbtools.utilities.core import create_photo_ids
+from fbtools.utilities.progress import ProgressCallback, ProgressReporter
 
-from aiofiles import open as aopen
+logger = logging.getLogger(__name__)
 
 
 class Page:
@@ -51,12 +57,13 @@ class Page:
         }
 
         if session is None:
-            session = AsyncClient(base_url=create_base_url(), timeout=60)
+            session = create_session()
 
         response = await session.get(user_id, params=params)
+        raise_for_status(response=response)
 
         # validate data
-        page_data = PageDataItem.model_validate(response.json())
+        page_data = PageDataItem.model_validate_json(response.content)
 
         # add data to page
         return cls(page_data=page_data, session=session)
@@ -94,20 +101,19 @@ class Page:
             if isinstance(images, str):
                 images = [images]
 
-            # TODO: Needs further optimization if many attachment images
-            #       will be uploaded.
-            data.attached_media = []
-            for attachment in images:
-                photo_id = await create_photo_id(
-                    attachment, self._access_token, self._session
-                )
-                data.attached_media.append(AttachedMedia(media_fbid=photo_id))
+            photo_ids = await create_photo_ids(
+                images, self._access_token, self._session
+            )
+            data.attached_media = [
+                AttachedMedia(media_fbid=photo_id) for photo_id in photo_ids
+            ]
 
         response = await self._session.post(
             url_path, json=data.model_dump(), params=params
         )
+        raise_for_status(response=response)
 
-        id_response = IdResponse.model_validate(response.json())
+        id_response = IdResponse.model_validate_json(response.content)
 
         return FacebookPost(
             post_id=id_response.id,
@@ -121,18 +127,7 @@ class Page:
         title: str,
         description: str,
         user_id: str | Literal["me"] = "me",
-        progress_callback: (
-            Callable[
-                [
-                    float,
-                    float,
-                    float,
-                    Literal["uploading", "publishing", "finished"],
-                ],
-                Coroutine[None, None, None],
-            ]
-            | None
-        ) = None,
+        progress_callback: ProgressCallback | None = None,
         wait_published: bool = True,
     ) -> FacebookPost:
         """Create a video post.
@@ -175,31 +170,43 @@ class Page:
             }
 
             response = await self._session.post(url_path, params=params, timeout=300)
+            raise_for_status(response=response)
 
-            video_id = IdResponse.model_validate(response.json()).id
+            video_id = IdResponse.model_validate_json(response.content).id
 
             if progress_callback is not None:
                 await progress_callback(100.0, 100.0, 100.0, "finished")
 
-            params = {"access_token": self._access_token, "fields": "status"}
+            # post_id is requested along with the status so the last
+            # poll already carries it
+            params = {"access_token": self._access_token, "fields": "status,post_id"}
+            feed_id: str | None = None
+            delay = 1.0
 
             # wait for the video to be published
-            while True and wait_published:
+            while wait_published:
                 response = await self._session.get(video_id, params=params)
-                video_upload_status = VideoUploadStatus.model_validate(response.json())
+                raise_for_status(response=response)
+                video_upload_status = VideoUploadStatus.model_validate_json(
+                    response.content
+                )
 
                 if video_upload_status.status.video_status == "ready":
+                    feed_id = video_upload_status.post_id
                     break
 
                 if video_upload_status.status.error is not None:
                     raise ValueError(video_upload_status.status.error.message)
 
-                await asyncio.sleep(1)
+                # back off, encoding large videos can take minutes
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, 30.0)
 
-            params["fields"] = "post_id"
-            response = await self._session.get(video_id, params=params)
-
-            feed_id = FeedIdResponse.model_validate(response.json()).post_id
+            if feed_id is None:
+                params["fields"] = "post_id"
+                response = await self._session.get(video_id, params=params)
+                raise_for_status(response=response)
+                feed_id = FeedIdResponse.model_validate_json(response.content).post_id
 
             return FacebookPost(
                 post_id=feed_id,
@@ -209,124 +216,201 @@ class Page:
 
         else:
 
-            # check if file exists
-            if not Path(filepath_or_url).exists():
-                raise FileNotFoundError(f"File {filepath_or_url} does not exist.")
+            # check if file exists and get file size with a single stat,
+            # off the event loop since it can block on network filesystems
+            try:
+                file_stat = await asyncio.to_thread(Path(filepath_or_url).stat)
+            except FileNotFoundError:
+                raise FileNotFoundError(
+                    f"File {filepath_or_url} does not exist."
+                ) from None
 
-            # get file size
-            file_size = Path(filepath_or_url).stat().st_size
+            file_size = file_stat.st_size
 
             # for callback
             total_mb = file_size / (1024 * 1024)  # convert to mb
             uploaded_bytes = 0
             uploaded_mb = 0
             percentage = 0.0
-            progress_callback_tasks: list[asyncio.Task[None]] = []
-
-            # get upload session id
-            params = {
-                "upload_phase": "start",
-                "file_size": file_size,
-                "access_token": self._access_token,
-            }
-
-            response = await self._session.post(url_path, params=params)
-
-            vsp = VideoStartPhaseResponse.model_validate(response.json())
+            progress_reporter = (
+                ProgressReporter(progress_callback)
+                if progress_callback is not None
+                else None
+            )
 
-            async with aopen(filepath_or_url, "rb") as video_file:
-                while vsp.start_offset != vsp.end_offset:
-                    # seek the current start offset and read the chunk
-                    await video_file.seek(
-                        vsp.start_offset
-                    )  # pyright: ignore[reportUnusedCallResult]
-                    chunk_size = vsp.end_offset - vsp.start_offset
-                    chunk_data = await video_file.read(chunk_size)
+            try:
+                # get upload session id
+                params = {
+                    "upload_phase": "start",
+                    "file_size": file_size,
+                    "access_token": self._access_token,
+                }
+
+                response = await self._session.post(url_path, params=params)
+                raise_for_status(response=response)
+
+                vsp = VideoStartPhaseResponse.model_validate_json(response.content)
+
+                # plain unbuffered file, chunks are read by offset in a worker thread
+                with open(filepath_or_url, "rb", buffering=0) as video_file:
+                    chunk_data = await asyncio.to_thread(
+                        read_chunk,
+                        video_file,
+                        vsp.end_offset - vsp.start_offset,
+                        vsp.start_offset,
+                    )
+                    next_chunk_task: asyncio.Task[bytes] | None = None
 
-                    # upload the chunk
-                    transfer_payload = {
+                    # only the start offset changes between chunks
+                    transfer_payload: dict[str, str | int] = {
                         "upload_phase": "transfer",
                         "upload_session_id": vsp.upload_session_id,
                         "start_offset": vsp.start_offset,
                         "access_token": self._access_token,
                     }
 
-                    files = {
-                        "video_file_chunk": (
-                            "chunk",
-                            chunk_data,
-                            "application/octet-stream",
-                        )
-                    }
+                    try:
+                        while vsp.start_offset != vsp.end_offset:
+                            chunk_size = vsp.end_offset - vsp.start_offset
 
-                    response = await self._session.post(
-                        url=url_path, data=transfer_payload, files=files, timeout=30
-                    )
+                            # prefetch the next chunk while the current one is uploading,
+                            # facebook usually asks for the next range with the same size
+                            next_start_offset = vsp.end_offset
+                            next_end_offset = min(
+                                next_start_offset + chunk_size, file_size
+                            )
 
-                    response_data = VideoUploadingLocalFileResponse.model_validate(
-                        response.json()
-                    )
+                            if next_start_offset < next_end_offset:
+                                next_chunk_task = asyncio.create_task(
+                                    asyncio.to_thread(
+                                        read_chunk,
+                                        video_file,
+                                        next_end_offset - next_start_offset,
+                                        next_start_offset,
+                                    )
+                                )
 
-                    vsp.start_offset = response_data.start_offset
-                    vsp.end_offset = response_data.end_offset
+                            # upload the chunk
+                            transfer_payload["start_offset"] = vsp.start_offset
 
-                    # calculate progress
-                    uploaded_bytes += chunk_size
-                    uploaded_mb = uploaded_bytes / (1024 * 1024)
-                    percentage = (uploaded_bytes / file_size) * 100
+                            files = {
+                                "video_file_chunk": (
+                                    "chunk",
+                                    chunk_data,
+                                    "application/octet-stream",
+                                )
+                            }
 
-                    if progress_callback is not None:
-                        progress_callback_tasks.append(
-                            asyncio.create_task(
-                                progress_callback(
-                                    uploaded_mb, total_mb, percentage, "uploading"
+                            response = await self._session.post(
+                                url=url_path,
+                                data=transfer_payload,
+                                files=files,
+                                timeout=30,
+                            )
+                            raise_for_status(response=response)
+
+                            response_data = (
+                                VideoUploadingLocalFileResponse.model_validate_json(
+                                    response.content
                                 )
                             )
-                        )
-
-                    else:
-                        progress_bar = f"[{'█' * int(percentage // 2)}{' ' * (50 - int(percentage // 2))}]"
-                        print(
-                            f"\rUploading: {progress_bar} {uploaded_mb:.2f}MB / {total_mb:.2f}MB ({percentage:.2f}%)",
-                            end="",
-                        )
-
-            # finish the upload session
-            # and publish video post
-            finish_payload = {
-                "upload_phase": "finish",
-                "upload_session_id": vsp.upload_session_id,
-                "access_token": self._access_token,
-                "title": title,
-                "description": description,
-            }
 
-            response = await self._session.post(
-                url_path, data=finish_payload, timeout=300
-            )
+                            vsp.start_offset = response_data.start_offset
+                            vsp.end_offset = response_data.end_offset
 
-            # wait until all progress callbacks are finished
-            if progress_callback is not None:
-                progress_callback_tasks.append(
-                    asyncio.create_task(
-                        progress_callback(uploaded_mb, total_mb, percentage, "finished")
-                    )
+                            # use the prefetched chunk if facebook asked for that range
+                            prefetched_data = (
+                                await next_chunk_task
+                                if next_chunk_task is not None
+                                else b""
+                            )
+                            next_chunk_task = None
+
+                            if (vsp.start_offset, vsp.end_offset) == (
+                                next_start_offset,
+                                next_end_offset,
+                            ):
+                                chunk_data = prefetched_data
+
+                            elif vsp.start_offset != vsp.end_offset:
+                                chunk_data = await asyncio.to_thread(
+                                    read_chunk,
+                                    video_file,
+                                    vsp.end_offset - vsp.start_offset,
+                                    vsp.start_offset,
+                                )
+
+                            # calculate progress
+                            uploaded_bytes += chunk_size
+                            uploaded_mb = uploaded_bytes / (1024 * 1024)
+                            percentage = (uploaded_bytes / file_size) * 100
+
+                            if progress_reporter is not None:
+                                progress_reporter.update(
+                                    uploaded_mb, total_mb, percentage, "uploading"
+                                )
+
+                            else:
+                                progress_bar = f"[{'█' * int(percentage // 2)}{' ' * (50 - int(percentage // 2))}]"
+                                print(
+                                    f"\rUploading: {progress_bar} {uploaded_mb:.2f}MB / {total_mb:.2f}MB ({percentage:.2f}%)",
+                                    end="",
+                                )
+
+                    finally:
+                        # don't close the file while a prefetch is still reading it
+                        if next_chunk_task is not None:
+                            await asyncio.wait([next_chunk_task])
+
+                            # an upload error is already propagating, only
+                            # retrieve the prefetch error so it isn't logged
+                            if not next_chunk_task.cancelled():
+                                next_chunk_task.exception()  # pyright: ignore[reportUnusedCallResult]
+
+                # finish the upload session
+                # and publish video post
+                finish_payload = {
+                    "upload_phase": "finish",
+                    "upload_session_id": vsp.upload_session_id,
+                    "access_token": self._access_token,
+                    "title": title,
+                    "description": description,
+                }
+
+                response = await self._session.post(
+                    url_path, data=finish_payload, timeout=300
                 )
+                raise_for_status(response=response)
 
-                await asyncio.gather(
-                    *progress_callback_tasks
-                )  # pyright: ignore[reportUnusedCallResult]
+                # wait until the progress callback is finished
+                if progress_reporter is not None:
+                    progress_reporter.update(
+                        uploaded_mb, total_mb, percentage, "finished"
+                    )
+                    await progress_reporter.close()
 
-            print()  # will move cursor to the next line
+            finally:
+                # stop the progress worker if the upload failed midway
+                if progress_reporter is not None:
+                    await progress_reporter.cancel()
 
-            # get post id
-            params = {"access_token": self._access_token, "fields": "status"}
+            # move cursor to the next line after the progress bar
+            if progress_reporter is None:
+                print()
+
+            # get post id along with the status
+            params = {"access_token": self._access_token, "fields": "status,post_id"}
+            feed_id = None
+            delay = 1.0
 
             # wait for the video to be published
-            while True and wait_published:
+            while wait_published:
                 response = await self._session.get(vsp.video_id, params=params)
+                raise_for_status(response=response)
 
-                video_upload_status = VideoUploadStatus.model_validate(response.json())
+                video_upload_status = VideoUploadStatus.model_validate_json(
+                    response.content
+                )
 
                 bytes_transferred = (
                     video_upload_status.status.uploading_phase.bytes_transfered
@@ -342,7 +426,7 @@ class Page:
                 ):
                     _percentage = (bytes_transferred / total_size) * 100
                     # TODO add callback algorithm here
-                    print(f"Video upload progress: {_percentage:.2f}%")
+                    logger.debug("Video upload progress: %.2f%%", _percentage)
 
                 if video_upload_status.status.video_status == "error":
                     # check who got errors
@@ -360,6 +444,7 @@ class Page:
 
                 if video_upload_status.status.video_status == "ready":
                     # stop the loop
+                    feed_id = video_upload_status.post_id
                     break
 
                 if video_upload_status.status.error is not None:
@@ -368,16 +453,18 @@ class Page:
                         + video_upload_status.status.error.message
                     )
 
-                # avoid fast loop
-                await asyncio.sleep(1)
-
-            params["fields"] = "post_id"
-            response = await self._session.get(vsp.video_id, params=params)
+                # avoid fast loop, back off since processing can take minutes
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, 30.0)
 
-            response_data = FeedIdResponse.model_validate(response.json())
+            if feed_id is None:
+                params["fields"] = "post_id"
+                response = await self._session.get(vsp.video_id, params=params)
+                raise_for_status(response=response)
+                feed_id = FeedIdResponse.model_validate_json(response.content).post_id
 
             return FacebookPost(
-                post_id=response_data.post_id,
+                post_id=feed_id,
                 access_token=self._access_token,
                 session=self._session,
             )
@@ -1,5 +1,6 @@
 """Post node of Facebook Graph API."""
 
+import asyncio
 from pathlib import Path
 from httpx import AsyncClient
 
@@ -7,7 +8,7 @@ from fbtools.models.page.feed_post_upload import AttachedMedia, FeedPostUploadDa
 from fbtools.models.page.id_response import IdResponse
 from fbtools.models.utilities.bool_response import BoolResponse
 from fbtools.utilities.common import is_url_valid, raise_for_status
-from fbtools.utilities.core import create_photo_id
+from fbtools.utilities.core import create_photo_id, create_photo_ids
 
 
 class FacebookPost:
@@ -48,17 +49,14 @@ class FacebookPost:
             if isinstance(attachments, str):
                 attachments = [attachments]
 
-            data.attached_media = []
-
-            for attachment in attachments:
-                # TODO: Needs further optimization if many attachment images
-                #       will be uploaded.
-                photo_id = await create_photo_id(
-                    photo_url_or_file_path=attachment,
-                    access_token=self._access_token,
-                    session=self._session,
-                )
-                data.attached_media.append(AttachedMedia(media_fbid=photo_id))
+            photo_ids = await create_photo_ids(
+                photo_urls_or_file_paths=attachments,
+                access_token=self._access_token,
+                session=self._session,
+            )
+            data.attached_media = [
+                AttachedMedia(media_fbid=photo_id) for photo_id in photo_ids
+            ]
 
         params = {"access_token": self._access_token}
         response = await self._session.post(
@@ -66,7 +64,7 @@ class FacebookPost:
         )
         raise_for_status(response=response)
 
-        bool_response = BoolResponse.model_validate(response.json())
+        bool_response = BoolResponse.model_validate_json(response.content)
 
         return bool_response.success
 
@@ -75,7 +73,7 @@ class FacebookPost:
         params = {"access_token": self._access_token}
         response = await self._session.delete(self._post_id, params=params)
         raise_for_status(response=response)
-        response_data = BoolResponse.model_validate(response.json())
+        response_data = BoolResponse.model_validate_json(response.content)
         return response_data.success
 
     async def add_comment(self, message: str, attachment: str | None = None) -> str:
@@ -101,7 +99,7 @@ class FacebookPost:
             if is_url_valid(attachment):
                 data["attachment_url"] = attachment
 
-            elif Path(attachment).is_file():
+            elif await asyncio.to_thread(Path(attachment).is_file):
                 photo_id = await create_photo_id(
                     photo_url_or_file_path=attachment,
                     access_token=self._access_token,
@@ -116,6 +114,6 @@ class FacebookPost:
         response = await self._session.post(url, json=data, params=params)
         raise_for_status(response=response)
 
-        response_data = IdResponse.model_validate(response.json())
+        response_data = IdResponse.model_validate_json(response.content)
 
         return response_data.id
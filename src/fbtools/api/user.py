@@ -4,6 +4,7 @@ from typing import Literal
 from httpx import AsyncClient
 
 from fbtools.models.users.response import LoginAsTokenResponse
+from fbtools.utilities.common import create_session, raise_for_status
 
 
 class User:
@@ -28,7 +29,7 @@ class User:
 
         # objects
         self._session: AsyncClient = (
-            AsyncClient(base_url="https://graph.facebook.com/", timeout=60)
+            create_session(base_url="https://graph.facebook.com/")
             if session is None
             else session
         )
@@ -44,14 +45,14 @@ class User:
             skip_validation: Skip validation of access token.
 
         Raises:
-            ClientResponseError: Response error.
+            HTTPStatusError: Response error.
 
         """
         if not skip_validation:
             params = {"access_token": user_access_token, "fields": "short_name"}
             response = await self._session.get(self.user_id, params=params)
-            response = response.raise_for_status()
-            response_data = LoginAsTokenResponse.model_validate(await response.json())
+            raise_for_status(response=response)
+            response_data = LoginAsTokenResponse.model_validate_json(response.content)
             self.user_id = response_data.id
             self.short_name = response_data.short_name
 
@@ -29,6 +29,7 @@ class VideoUploadStatus(BaseModel):
     """
 
     status: "VideoStatus"
+    post_id: str | None = None
 
 
 class VideoStatus(BaseModel):
@@ -0,0 +1,22 @@
+"""Batch response model.
+
+Exposed models:
+    1. BatchResponse
+    2. BatchResponseItem
+"""
+
+from pydantic import BaseModel, RootModel
+
+
+class BatchResponse(RootModel[list["BatchResponseItem | None"]]):
+    """Responses of a batch request in the same order as the requests.
+
+    Timed out requests inside the batch are None.
+    """
+
+
+class BatchResponseItem(BaseModel):
+    """Response of a single request inside a batch."""
+
+    code: int
+    body: str | None = None
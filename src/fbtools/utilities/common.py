@@ -1,29 +1,67 @@
 """Common utilties."""
 
+import os
+from typing import BinaryIO
 from urllib.parse import urlparse
 
-from httpx import HTTPStatusError, Response
+from httpx import AsyncClient, HTTPStatusError, Limits, Response, Timeout
 
 from fbtools.utilities.global_instance import GraphApiVersion
 
 
 def create_base_url() -> str:
     """Create a url format for the Facebook Graph API."""
-    current_version = GraphApiVersion.get_version()
-    return f"https://graph.facebook.com/{current_version}"
+    return GraphApiVersion.get_base_url()
+
+
+def create_session(base_url: str | None = None) -> AsyncClient:
+    """Create an async session tuned for the Graph API.
+
+    Connections are kept alive long enough to be reused between
+    video chunks and polls. Proxies from the environment are honored.
+
+    Args:
+        base_url: Base url of the session. Defaults to the current Graph API version.
+
+    """
+    return AsyncClient(
+        base_url=create_base_url() if base_url is None else base_url,
+        timeout=Timeout(60, connect=10),
+        http2=True,
+        limits=Limits(
+            max_connections=32, max_keepalive_connections=16, keepalive_expiry=300
+        ),
+    )
 
 
 def is_url_valid(url: str) -> bool:
     """Check if url is valid."""
+    # cheap scheme check first, file paths never get parsed
+    if not url[:8].lower().startswith(("http://", "https://")):
+        return False
+
     result = urlparse(url)
-    return all([result.scheme in ("http", "https"), result.netloc])
+    return bool(result.netloc)
 
 
 def raise_for_status(response: Response):
-    """Raise for status."""
-    if response.status_code != 200:
+    """Raise for status if the response is not 2xx."""
+    if not response.is_success:
         raise HTTPStatusError(
             message=f"{response.status_code} {response.text}",
             request=response.request,
             response=response,
         )
+
+
+def read_chunk(file: BinaryIO, size: int, offset: int) -> bytes:
+    """Read a chunk of the file at the given offset.
+
+    Uses a single pread call where available instead of seek + read.
+    This is blocking, run it in a thread from async code.
+    """
+    if hasattr(os, "pread"):
+        return os.pread(file.fileno(), size, offset)
+
+    file.seek(offset)  # pyright: ignore[reportUnusedCallResult]
+    return file.read(size)
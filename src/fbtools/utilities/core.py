@@ -1,12 +1,38 @@
 """Core utilities for the APIs."""
 
+import asyncio
+import json
+from collections.abc import Coroutine
 from pathlib import Path
-from typing import Literal
-from aiofiles import open as aopen
+from typing import Any, Literal
+from urllib.parse import urlencode
 from httpx import AsyncClient
 
 from fbtools.models.page.id_response import IdResponse
-from fbtools.utilities.common import is_url_valid
+from fbtools.models.utilities.batch_response import BatchResponse, BatchResponseItem
+from fbtools.utilities.common import is_url_valid, raise_for_status
+
+# maximum number of requests the Graph API accepts in one batch
+BATCH_LIMIT = 50
+
+
+async def _gather_or_cancel[T](*coroutines: Coroutine[Any, Any, T]) -> list[T]:
+    """Run coroutines concurrently, cancelling the rest as soon as one fails.
+
+    The first error is raised only after the cancelled tasks have stopped,
+    so no request keeps running in the background.
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+
+    try:
+        return await asyncio.gather(*tasks)
+
+    except BaseException:
+        for task in tasks:
+            task.cancel()  # pyright: ignore[reportUnusedCallResult]
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
 
 
 async def create_photo_id(
@@ -31,7 +57,8 @@ async def create_photo_id(
 
     """
     data: dict[str, str | bool] = {}
-    file: dict[str, bytes] | None = None
+    params = {"access_token": access_token}
+    url_path = f"{user_id}/photos"
 
     # so the photo won't be uploaded on your feed
     # we only need the photo id
@@ -40,19 +67,152 @@ async def create_photo_id(
     # proper way to check if the url is valid
     if is_url_valid(photo_url_or_file_path):
         data["url"] = photo_url_or_file_path
+        response = await session.post(url_path, data=data, params=params)
 
     # check if the file path is valid and exists
-    elif Path(photo_url_or_file_path).is_file():
-        async with aopen(photo_url_or_file_path, mode="rb") as f:
-            file = {"source": await f.read()}
+    elif await asyncio.to_thread(Path(photo_url_or_file_path).is_file):
+        # httpx streams the file from disk while sending the request
+        with open(photo_url_or_file_path, mode="rb") as f:
+            response = await session.post(
+                url_path, data=data, params=params, files={"source": f}
+            )
     else:
         raise ValueError(f"Invalid photo url or file path: {photo_url_or_file_path}")
 
-    params = {"access_token": access_token}
+    raise_for_status(response=response)
 
-    response = await session.post(
-        f"{user_id}/photos", data=data, params=params, files=file
-    )
-
-    response_id = IdResponse.model_validate(response.json())
+    response_id = IdResponse.model_validate_json(response.content)
     return response_id.id
+
+
+async def create_photo_ids(
+    photo_urls_or_file_paths: list[str],
+    access_token: str,
+    session: AsyncClient,
+    user_id: str | Literal["me"] = "me",
+    max_concurrency: int = 8,
+) -> list[str]:
+    """Create photo ids concurrently from urls or local image files.
+
+    Notes:
+        Photo urls are sent together in a single batch request, local files
+        are uploaded concurrently. Uploads are capped by max_concurrency so
+        many attachments won't trip the Graph API rate limiter.
+
+    Args:
+        photo_urls_or_file_paths: The urls or local image file paths.
+        access_token: Page access token.
+        session: Async Httpx Session.
+        user_id: User ID or "me". The "me" is used on dev mode.
+        max_concurrency: Maximum number of uploads running at the same time.
+
+    Returns:
+        The photo ids in the same order as the given photos.
+
+    Raises:
+        ValueError: If one of the photo urls or file paths is invalid.
+        Exception: If one of the photo urls failed inside the batch.
+
+    """
+    photo_ids: list[str] = [""] * len(photo_urls_or_file_paths)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    url_indexes = [
+        index
+        for index, photo in enumerate(photo_urls_or_file_paths)
+        if is_url_valid(photo)
+    ]
+
+    # a single url is not worth a batch request
+    if len(url_indexes) < 2:
+        url_indexes = []
+
+    async def _create_photo_id(index: int) -> None:
+        async with semaphore:
+            photo_ids[index] = await create_photo_id(
+                photo_url_or_file_path=photo_urls_or_file_paths[index],
+                access_token=access_token,
+                session=session,
+                user_id=user_id,
+            )
+
+    async def _create_url_photo_ids() -> None:
+        # so the photos won't be uploaded on your feed
+        requests = [
+            {
+                "method": "POST",
+                "relative_url": f"{user_id}/photos",
+                "body": urlencode(
+                    {"url": photo_urls_or_file_paths[index], "published": "false"}
+                ),
+            }
+            for index in url_indexes
+        ]
+
+        async with semaphore:
+            responses = await graph_batch(requests, access_token, session)
+
+        for index, item in zip(url_indexes, responses, strict=True):
+            if item is None or not 200 <= item.code < 300 or item.body is None:
+                raise Exception(
+                    f"Failed to create photo id for {photo_urls_or_file_paths[index]}. "
+                    + ("Request timed out." if item is None else str(item.body))
+                )
+
+            photo_ids[index] = IdResponse.model_validate_json(item.body).id
+
+    batched_indexes = set(url_indexes)
+    tasks = [
+        _create_photo_id(index)
+        for index in range(len(photo_urls_or_file_paths))
+        if index not in batched_indexes
+    ]
+
+    if url_indexes:
+        tasks.append(_create_url_photo_ids())
+
+    await _gather_or_cancel(*tasks)  # pyright: ignore[reportUnusedCallResult]
+
+    return photo_ids
+
+
+async def graph_batch(
+    requests: list[dict[str, str]],
+    access_token: str,
+    session: AsyncClient,
+) -> list[BatchResponseItem | None]:
+    """Send many Graph API requests in one round-trip using the batch endpoint.
+
+    Notes:
+        The Graph API only accepts 50 requests per batch, bigger lists are
+        split and the batches are sent concurrently.
+
+    Docs:
+        https://developers.facebook.com/docs/graph-api/batch-requests
+
+    Args:
+        requests: The batch requests, e.g. {"method": "GET", "relative_url": "me"}.
+        access_token: Fallback access token for requests without one.
+        session: Async Httpx Session.
+
+    Returns:
+        The responses in the same order as the requests, None for the
+        requests that timed out.
+
+    """
+    params = {"access_token": access_token, "include_headers": "false"}
+
+    async def _send(batch: list[dict[str, str]]) -> list[BatchResponseItem | None]:
+        response = await session.post(
+            "", data={"batch": json.dumps(batch)}, params=params
+        )
+        raise_for_status(response=response)
+        return BatchResponse.model_validate_json(response.content).root
+
+    results = await _gather_or_cancel(
+        *(
+            _send(requests[index : index + BATCH_LIMIT])
+            for index in range(0, len(requests), BATCH_LIMIT)
+        )
+    )
+    return [item for batch_result in results for item in batch_result]
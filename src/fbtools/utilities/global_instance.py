@@ -33,12 +33,22 @@ class GraphApiVersion:
     # that works with the library.
     _version: str = "v22.0"
 
+    # Base url of the current version, rebuilt only
+    # when the version changes.
+    _base_url: str = f"https://graph.facebook.com/{_version}"
+
     @classmethod
     def get_version(cls):
         """Get version of the Graph API."""
         return cls._version
 
+    @classmethod
+    def get_base_url(cls):
+        """Get base url of the current Graph API version."""
+        return cls._base_url
+
     @classmethod
     def set_version(cls, value: str):
         """Set version of the Graph API."""
         cls._version = value
+        cls._base_url = f"https://graph.facebook.com/{value}"
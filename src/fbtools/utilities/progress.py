@@ -0,0 +1,87 @@
+"""Progress reporting for long running uploads."""
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Callable, Literal
+
+PROGRESSPHASE = Literal["uploading", "publishing", "finished"]
+ProgressCallback = Callable[
+    [float, float, float, PROGRESSPHASE], Coroutine[None, None, None]
+]
+
+
+class ProgressReporter:
+    """Run a progress callback from a single worker task.
+
+    Updates are coalesced, the callback only receives the latest
+    progress and is called at most max_rate times per second.
+    """
+
+    def __init__(self, callback: ProgressCallback, max_rate: float = 10.0):
+        """Initialize progress reporter.
+
+        Args:
+            callback: The progress callback method.
+            max_rate: Maximum number of callback calls per second.
+
+        """
+        # private attributes
+        self._callback: ProgressCallback = callback
+        self._interval: float = 1 / max_rate
+        self._latest: tuple[float, float, float, PROGRESSPHASE] | None = None
+        self._closed: bool = False
+
+        # objects
+        self._event: asyncio.Event = asyncio.Event()
+        self._worker: asyncio.Task[None] | None = None
+
+    def update(
+        self,
+        uploaded_mb: float,
+        total_mb: float,
+        percentage: float,
+        phase: PROGRESSPHASE,
+    ) -> None:
+        """Report the latest progress without waiting for the callback."""
+        self._latest = (uploaded_mb, total_mb, percentage, phase)
+        self._event.set()
+
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Deliver the latest progress and wait for the worker to finish."""
+        self._closed = True
+        self._event.set()
+
+        if self._worker is not None:
+            await self._worker
+
+    async def cancel(self) -> None:
+        """Stop the worker without delivering pending progress."""
+        if self._worker is None:
+            return
+
+        self._worker.cancel()
+        await asyncio.wait([self._worker])
+
+        # retrieve a callback error so it isn't reported as never retrieved
+        if not self._worker.cancelled():
+            self._worker.exception()  # pyright: ignore[reportUnusedCallResult]
+
+    async def _run(self) -> None:
+        while True:
+            await self._event.wait()
+            self._event.clear()
+
+            if self._latest is not None:
+                latest, self._latest = self._latest, None
+                await self._callback(*latest)
+
+            if self._closed:
+                if self._latest is None:
+                    return
+                continue
+
+            # throttle, updates received meanwhile are coalesced
+            await asyncio.sleep(self._interval)